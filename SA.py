@@ -1,19 +1,63 @@
 
+import re
+import sys
 from typing import Dict, List, Set, Tuple, FrozenSet
-from collections import defaultdict
+from collections import defaultdict, deque
 
 # ================ Constants ================
 EPSILON = 'ε'
 END_MARKER = '$'
 
+# Bit positions reserved in every terminal bitmask
+EPS_BIT = 1 << 0
+END_BIT = 1 << 1
+
+# Grammar rule: left side up to the first '->', then the alternatives
+RULE_RE = re.compile(r'\s*(.*?)\s*->(.*)$')
+
+# Conflict reported when a reduce lands on an ACTION cell, keyed by the
+# existing entry's first character ('s3', 'acc'); other reduces clash as
+# Reduce-Reduce
+CONFLICT_KINDS = {'s': "Shift-Reduce", 'a': "Accept-Reduce"}
+
+# Table printers flush their output buffer every this many rows
+FLUSH_ROWS = 1000
+
 # ================ Grammar Input ================
+def parse_rule(line: str) -> Tuple[str, List[List[str]]]:
+    """
+    Parse a single rule of the form A -> B C | d
+    
+    Returns:
+        Tuple[left side, list of alternatives]
+    
+    Raises:
+        ValueError: If the line is not a valid rule
+    """
+    match = RULE_RE.match(line)
+    if not match:
+        raise ValueError("Invalid format! Use: A -> B C | d")
+    
+    left, right = match.groups()
+    if not left:
+        raise ValueError("Left side cannot be empty!")
+    
+    alternatives = [alt.split() or [EPSILON] for alt in right.split("|")]
+    return left, alternatives
+
+
 def read_grammar() -> Tuple[Dict[str, List[List[str]]], str]:
     """
     Read grammar rules from user input
     
+    Piped input is read in one go without prompting.
+    
     Returns:
         Tuple[grammar dict, start symbol]
     """
+    if not sys.stdin.isatty():
+        return read_grammar_batch(sys.stdin.read().splitlines())
+    
     grammar = defaultdict(list)
     start = None
     
@@ -32,26 +76,17 @@ def read_grammar() -> Tuple[Dict[str, List[List[str]]], str]:
                     continue
                 break
             
-            if not line or "->" not in line:
-                print("Invalid format! Use: A -> B C | d")
-                continue
-            
             # Parse the rule
-            left, right = line.split("->", 1)
-            left = left.strip()
-            
-            if not left:
-                print("Left side cannot be empty!")
+            try:
+                left, alternatives = parse_rule(line)
+            except ValueError as e:
+                print(e)
                 continue
             
             # Set start symbol
             if start is None:
                 start = left
             
-            # Parse alternatives
-            alternatives = [alt.strip().split() for alt in right.split("|")]
-            alternatives = [alt if alt else [EPSILON] for alt in alternatives]
-            
             grammar[left].extend(alternatives)
             print(f"✓ Added: {left} -> {' | '.join(' '.join(alt) for alt in alternatives)}")
             
@@ -64,135 +99,339 @@ def read_grammar() -> Tuple[Dict[str, List[List[str]]], str]:
     return dict(grammar), start
 
 
-# ================ FIRST Set Computation ================
-def compute_first(grammar: Dict[str, List[List[str]]]) -> Dict[str, Set[str]]:
+def read_grammar_batch(lines: List[str]) -> Tuple[Dict[str, List[List[str]]], str]:
     """
-    Compute FIRST sets for all non-terminals
+    Read grammar rules from a list of lines, stopping at 'done'
+    
+    Added rules are echoed once as a summary instead of line by line.
+    
+    Returns:
+        Tuple[grammar dict, start symbol], or (None, None) if no rules
     """
-    FIRST = {nt: set() for nt in grammar}
-    changed = True
+    grammar = defaultdict(list)
+    start = None
+    added = []
     
-    while changed:
-        changed = False
+    # Nothing echoes the input, so end the pending prompt line first
+    print()
+    
+    for line in lines:
+        line = line.strip()
+        
+        if line.lower() == "done":
+            break
+        if not line:
+            continue
         
-        for A in grammar:
-            for production in grammar[A]:
-                for symbol in production:
-                    # Terminal or epsilon
-                    if symbol not in grammar:
-                        if symbol not in FIRST[A]:
-                            FIRST[A].add(symbol)
-                            changed = True
-                        break
-                    
-                    # Non-terminal
-                    old_size = len(FIRST[A])
-                    FIRST[A] |= (FIRST[symbol] - {EPSILON})
-                    
-                    if len(FIRST[A]) != old_size:
-                        changed = True
-                    
-                    # Stop if doesn't derive epsilon
-                    if EPSILON not in FIRST[symbol]:
-                        break
-                else:
-                    # All symbols derive epsilon
-                    if EPSILON not in FIRST[A]:
-                        FIRST[A].add(EPSILON)
-                        changed = True
+        try:
+            left, alternatives = parse_rule(line)
+        except ValueError as e:
+            print(f"Skipped '{line}': {e}")
+            continue
+        
+        # Set start symbol
+        if start is None:
+            start = left
+        
+        grammar[left].extend(alternatives)
+        added.append(f"  {left} -> {' | '.join(' '.join(alt) for alt in alternatives)}")
+    
+    if not grammar:
+        print("Warning: At least one rule is required!")
+        return None, None
+    
+    noun = "rule" if len(added) == 1 else "rules"
+    print(f"\n✓ Added {len(added)} {noun}:\n" + "\n".join(added))
+    return dict(grammar), start
+
+
+# ================ Symbol Interning ================
+def classify(grammar: Dict[str, List[List[str]]]) -> Tuple[List[str], List[str]]:
+    """
+    Split grammar symbols into non-terminals and terminals
+    
+    Both lists are in order of first appearance. ε and $ are not listed
+    as terminals.
+    
+    Returns:
+        Tuple[non-terminals, terminals]
+    """
+    nonterminals = list(grammar)
+    terminals = []
+    seen = set(grammar)
+    seen.update((EPSILON, END_MARKER))
+    
+    for A in grammar:
+        for production in grammar[A]:
+            for symbol in production:
+                if symbol not in seen:
+                    seen.add(symbol)
+                    terminals.append(symbol)
+    
+    return nonterminals, terminals
+
+
+def intern_grammar(grammar: Dict[str, List[List[str]]], 
+                   nonterminals: List[str], 
+                   terminals: List[str]) -> Tuple[List[str], List[List[Tuple[int, ...]]]]:
+    """
+    Map every grammar symbol to a small integer id
+    
+    Non-terminals take ids 0..N-1 in rule order, ε and $ take N and N+1,
+    and the remaining terminals follow. A terminal's bit in FIRST/FOLLOW
+    masks is its id minus N, so ε and $ land on EPS_BIT and END_BIT.
+    ε is dropped from right-hand sides: an ε-production is an empty tuple.
+    
+    Returns:
+        Tuple[id -> name list, productions indexed by non-terminal id]
+    """
+    names = nonterminals + [EPSILON, END_MARKER] + terminals
+    sym_id = {name: i for i, name in enumerate(names)}
+    
+    prods = [
+        [tuple(sym_id[s] for s in production if s != EPSILON) for production in grammar[A]]
+        for A in nonterminals
+    ]
+    
+    return names, prods
+
+
+def mask_terminals(mask: int, num_nt: int) -> List[int]:
+    """
+    Expand a terminal bitmask into the ids of the terminals it contains
+    """
+    terminals = []
+    
+    while mask:
+        lsb = mask & -mask
+        terminals.append(num_nt + lsb.bit_length() - 1)
+        mask ^= lsb
+    
+    return terminals
+
+
+# ================ FIRST Set Computation ================
+def compute_first(prods: List[List[Tuple[int, ...]]]) -> List[int]:
+    """
+    Compute FIRST sets for all non-terminals as terminal bitmasks
+    
+    Every non-terminal is evaluated once; afterwards a non-terminal is
+    only re-evaluated when the FIRST set of a non-terminal in one of its
+    productions' leading positions (up to the first terminal) has grown.
+    """
+    num_nt = len(prods)
+    FIRST = [0] * num_nt
+    
+    # dependents[B] = non-terminals whose FIRST can depend on FIRST(B)
+    dependents = [set() for _ in range(num_nt)]
+    
+    for A in range(num_nt):
+        for production in prods[A]:
+            for symbol in production:
+                # Nothing after a terminal can reach FIRST(A)
+                if symbol >= num_nt:
+                    break
+                dependents[symbol].add(A)
+    
+    worklist = deque(range(num_nt))
+    queued = [True] * num_nt
+    
+    while worklist:
+        A = worklist.popleft()
+        queued[A] = False
+        
+        new = FIRST[A]
+        for production in prods[A]:
+            new |= compute_first_of_sequence(production, FIRST, num_nt)
+        
+        if new != FIRST[A]:
+            FIRST[A] = new
+            for B in dependents[A]:
+                if not queued[B]:
+                    queued[B] = True
+                    worklist.append(B)
     
     return FIRST
 
 
 # ================ FOLLOW Set Computation ================
-def compute_follow(grammar: Dict[str, List[List[str]]], 
-                   FIRST: Dict[str, Set[str]], 
-                   start: str) -> Dict[str, Set[str]]:
+def compute_follow(prods: List[List[Tuple[int, ...]]], 
+                   FIRST: List[int], 
+                   start: int) -> List[int]:
     """
-    Compute FOLLOW sets for all non-terminals
+    Compute FOLLOW sets for all non-terminals as terminal bitmasks
+    
+    A single pass over the grammar seeds FOLLOW(B) with FIRST(beta) and
+    records the FOLLOW(A) ⊆ FOLLOW(B) edges; propagate_includes() then
+    closes the sets over those edges in one traversal.
     """
-    FOLLOW = {nt: set() for nt in grammar}
-    FOLLOW[start].add(END_MARKER)
-    changed = True
+    num_nt = len(prods)
+    FOLLOW = [0] * num_nt
+    FOLLOW[start] |= END_BIT
     
-    while changed:
-        changed = False
-        
-        for A in grammar:
-            for production in grammar[A]:
-                for i, B in enumerate(production):
-                    # Skip terminals
-                    if B not in grammar:
-                        continue
-                    
-                    # Get beta (rest of production after B)
-                    beta = production[i+1:]
-                    first_beta = compute_first_of_sequence(beta, FIRST, grammar)
-                    
-                    old_size = len(FOLLOW[B])
-                    FOLLOW[B] |= (first_beta - {EPSILON})
-                    
-                    # If beta derives epsilon or is empty, add FOLLOW(A)
-                    if EPSILON in first_beta or not beta:
-                        FOLLOW[B] |= FOLLOW[A]
-                    
-                    if len(FOLLOW[B]) != old_size:
-                        changed = True
+    # includes[B] = non-terminals A with FOLLOW(A) ⊆ FOLLOW(B)
+    includes = [set() for _ in range(num_nt)]
+    
+    for A in range(num_nt):
+        for production in prods[A]:
+            suffix_first = compute_suffix_firsts(production, FIRST, num_nt)
+            
+            for i, B in enumerate(production):
+                # Skip terminals
+                if B >= num_nt:
+                    continue
+                
+                # FIRST of beta (rest of production after B)
+                first_beta = suffix_first[i+1]
+                
+                FOLLOW[B] |= first_beta & ~EPS_BIT
+                
+                # If beta derives epsilon or is empty, FOLLOW(A) flows into B
+                if first_beta & EPS_BIT and B != A:
+                    includes[B].add(A)
+    
+    propagate_includes(FOLLOW, includes)
     
     return FOLLOW
 
 
-def compute_first_of_sequence(sequence: List[str], 
-                              FIRST: Dict[str, Set[str]], 
-                              grammar: Dict[str, List[List[str]]]) -> Set[str]:
+def propagate_includes(sets: List[int], includes: List[Set[int]]):
+    """
+    Close bitmask sets over an inclusion relation, in place
+    
+    Afterwards sets[x] contains sets[y] for every y reachable from x via
+    includes. This is the DeRemer-Pennello digraph traversal: Tarjan's SCC
+    search that ORs each successor into its predecessor on the way back,
+    then hands every member of a strongly connected component the root's
+    set, so cycles are resolved without iterating to a fixed point.
+    """
+    done = len(sets) + 1
+    depth = [0] * len(sets)
+    stack = []
+    
+    for root in range(len(sets)):
+        if depth[root]:
+            continue
+        
+        stack.append(root)
+        depth[root] = len(stack)
+        work = [(root, len(stack), iter(includes[root]))]
+        
+        while work:
+            x, d, successors = work[-1]
+            
+            for y in successors:
+                if not depth[y]:
+                    # Descend; y is merged into x once it is finished
+                    stack.append(y)
+                    depth[y] = len(stack)
+                    work.append((y, len(stack), iter(includes[y])))
+                    break
+                
+                depth[x] = min(depth[x], depth[y])
+                sets[x] |= sets[y]
+            else:
+                work.pop()
+                
+                # x is the root of an SCC: every member shares its set
+                if depth[x] == d:
+                    while True:
+                        y = stack.pop()
+                        depth[y] = done
+                        sets[y] = sets[x]
+                        if y == x:
+                            break
+                
+                if work:
+                    parent = work[-1][0]
+                    depth[parent] = min(depth[parent], depth[x])
+                    sets[parent] |= sets[x]
+
+
+def compute_first_of_sequence(sequence: Tuple[int, ...], 
+                              FIRST: List[int], 
+                              num_nt: int) -> int:
     """
-    Compute FIRST set of a sequence of symbols
+    Compute FIRST set of a sequence of symbols as a terminal bitmask
     """
-    result = set()
+    result = 0
     
     for symbol in sequence:
-        if symbol not in grammar:
+        if symbol >= num_nt:
             # Terminal
-            result.add(symbol)
-            return result
+            return result | 1 << (symbol - num_nt)
         
         # Non-terminal
-        result |= (FIRST[symbol] - {EPSILON})
+        result |= FIRST[symbol] & ~EPS_BIT
         
-        if EPSILON not in FIRST[symbol]:
+        if not FIRST[symbol] & EPS_BIT:
             return result
     
     # All symbols derive epsilon
-    result.add(EPSILON)
-    return result
+    return result | EPS_BIT
+
+
+def compute_suffix_firsts(sequence: Tuple[int, ...], 
+                          FIRST: List[int], 
+                          num_nt: int) -> List[int]:
+    """
+    Compute FIRST of every suffix of a sequence in one right-to-left pass
+    
+    Returns:
+        List where entry i is FIRST(sequence[i:]); the last entry is {ε}
+    """
+    suffix_first = [0] * len(sequence) + [EPS_BIT]
+    
+    for i in range(len(sequence) - 1, -1, -1):
+        symbol = sequence[i]
+        
+        if symbol >= num_nt:
+            # Terminal
+            suffix_first[i] = 1 << (symbol - num_nt)
+        elif FIRST[symbol] & EPS_BIT:
+            # Nullable non-terminal: the rest of the suffix shows through
+            suffix_first[i] = (FIRST[symbol] & ~EPS_BIT) | suffix_first[i+1]
+        else:
+            suffix_first[i] = FIRST[symbol]
+    
+    return suffix_first
 
 
 # ================ LL(1) Parsing Table ================
-def build_ll1_table(grammar: Dict[str, List[List[str]]], 
-                    FIRST: Dict[str, Set[str]], 
-                    FOLLOW: Dict[str, Set[str]]) -> Dict[str, Dict[str, List[str]]]:
+def build_ll1_table(prods: List[List[Tuple[int, ...]]], 
+                    FIRST: List[int], 
+                    FOLLOW: List[int], 
+                    names: List[str]) -> Dict[int, Dict[int, Tuple[int, ...]]]:
     """
     Build LL(1) parsing table
     """
-    table = {nt: {} for nt in grammar}
+    num_nt = len(prods)
+    table = {A: {} for A in range(num_nt)}
     conflicts = []
+    first_cache = {}
     
-    for A in grammar:
-        for production in grammar[A]:
-            first_set = compute_first_of_sequence(production, FIRST, grammar)
+    for A in range(num_nt):
+        row = table[A]
+        
+        for production in prods[A]:
+            # Identical alternatives share one FIRST computation
+            first_set = first_cache.get(production)
+            if first_set is None:
+                first_set = compute_first_of_sequence(production, FIRST, num_nt)
+                first_cache[production] = first_set
             
             # Add entries for terminals in FIRST
-            for terminal in (first_set - {EPSILON}):
-                if terminal in table[A]:
-                    conflicts.append(f"Conflict at [{A}, {terminal}]")
-                table[A][terminal] = production
+            for terminal in mask_terminals(first_set & ~EPS_BIT, num_nt):
+                if row.get(terminal) is not None:
+                    conflicts.append(f"Conflict at [{names[A]}, {names[terminal]}]")
+                row[terminal] = production
             
             # If epsilon in FIRST, add entries for FOLLOW
-            if EPSILON in first_set:
-                for terminal in FOLLOW[A]:
-                    if terminal in table[A]:
-                        conflicts.append(f"Conflict at [{A}, {terminal}]")
-                    table[A][terminal] = production
+            if first_set & EPS_BIT:
+                for terminal in mask_terminals(FOLLOW[A], num_nt):
+                    if row.get(terminal) is not None:
+                        conflicts.append(f"Conflict at [{names[A]}, {names[terminal]}]")
+                    row[terminal] = production
     
     if conflicts:
         print("\n⚠️  WARNING: Grammar is not LL(1)!")
@@ -202,204 +441,258 @@ def build_ll1_table(grammar: Dict[str, List[List[str]]],
     return table
 
 
-def print_ll1_table(table: Dict[str, Dict[str, List[str]]]):
+def print_ll1_table(table: Dict[int, Dict[int, Tuple[int, ...]]], names: List[str]):
     """
     Print LL(1) parsing table in formatted output
     """
-    print("\n" + "="*80)
-    print("LL(1) PARSING TABLE")
-    print("="*80)
+    out = ["\n" + "="*80, "LL(1) PARSING TABLE", "="*80]
     
     # Get all terminals
-    terminals = sorted({t for nt in table for t in table[nt]})
+    terminals = sorted({t for nt in table for t in table[nt]}, key=lambda s: names[s])
     
     # Header
-    header = f"{'NT':^12s} | " + " | ".join(f"{t:^15s}" for t in terminals)
-    print(header)
-    print("-" * len(header))
+    header = f"{'NT':^12s} | " + " | ".join(f"{names[t]:^15s}" for t in terminals)
+    out.append(header)
+    out.append("-" * len(header))
     
     # Rows
-    for nt in sorted(table.keys()):
-        row = [f"{nt:^12s}"]
+    blank = " " * 15
+    for nt in sorted(table.keys(), key=lambda s: names[s]):
+        entries = table[nt]
+        row = [f"{names[nt]:^12s}"]
         for t in terminals:
-            if t in table[nt]:
-                prod = " ".join(table[nt][t])
-                row.append(f"{prod:^15s}")
+            production = entries.get(t)
+            if production is None:
+                row.append(blank)
             else:
-                row.append(f"{'':^15s}")
-        print(" | ".join(row))
+                prod = " ".join(names[s] for s in production) or EPSILON
+                row.append(f"{prod:^15s}")
+        out.append(" | ".join(row))
+        
+        if len(out) >= FLUSH_ROWS:
+            write_lines(out)
+            out.clear()
     
-    print("="*80 + "\n")
+    out.append("="*80 + "\n")
+    write_lines(out)
+
+
+def write_lines(lines: List[str]):
+    """Write buffered output lines to stdout in one call"""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 # ================ SLR(1) Parser ================
-def build_slr_parser(grammar: Dict[str, List[List[str]]], 
-                     FIRST: Dict[str, Set[str]], 
-                     FOLLOW: Dict[str, Set[str]], 
-                     start: str) -> Tuple[Dict, Dict, List, List[str]]:
+def build_slr_parser(prods: List[List[Tuple[int, ...]]], 
+                     FIRST: List[int], 
+                     FOLLOW: List[int], 
+                     start: int, 
+                     names: List[str]) -> Tuple[Dict, Dict, List, List[int]]:
     """
     Build SLR(1) parsing tables
-    """
-    # Augment grammar
-    aug_start = start + "'"
-    grammar = dict(grammar)
-    grammar[aug_start] = [[start]]
-    FOLLOW[aug_start] = set()
     
-    def closure(items: Set[Tuple]) -> FrozenSet:
+    Items are (production id, dot position) packed into one int as
+    p << dot_bits | dot.
+    """
+    num_nt = len(prods)
+    end_marker = num_nt + 1
+    
+    # Number the productions: prod_nt[p] -> rhs prod_rhs[p]
+    prod_nt = []
+    prod_rhs = []
+    nt_prods = []  # production ids of each non-terminal
+    for A in range(num_nt):
+        nt_prods.append(range(len(prod_rhs), len(prod_rhs) + len(prods[A])))
+        for production in prods[A]:
+            prod_nt.append(A)
+            prod_rhs.append(production)
+    
+    # Augment grammar; S' gets an id outside the non-terminal range
+    aug_prod = len(prod_rhs)
+    prod_nt.append(num_nt)
+    prod_rhs.append((start,))
+    prod_len = [len(rhs) for rhs in prod_rhs]
+    
+    # Enough low bits to hold any dot position 0..len(rhs)
+    dot_bits = max(prod_len).bit_length()
+    dot_mask = (1 << dot_bits) - 1
+    
+    def closure(items: Set[int]) -> FrozenSet[int]:
         """Compute closure of item set"""
         new_items = set(items)
-        changed = True
+        pending = deque(items)
+        expanded = set()
         
-        while changed:
-            changed = False
-            for (A, production, dot) in list(new_items):
-                if dot < len(production):
-                    B = production[dot]
-                    if B in grammar:
-                        for rule in grammar[B]:
-                            item = (B, tuple(rule), 0)
-                            if item not in new_items:
-                                new_items.add(item)
-                                changed = True
+        while pending:
+            item = pending.popleft()
+            p, dot = item >> dot_bits, item & dot_mask
+            if dot < prod_len[p]:
+                B = prod_rhs[p][dot]
+                # A non-terminal's productions only need adding once
+                if B < num_nt and B not in expanded:
+                    expanded.add(B)
+                    for q in nt_prods[B]:
+                        item = q << dot_bits
+                        if item not in new_items:
+                            new_items.add(item)
+                            pending.append(item)
         
         return frozenset(new_items)
     
-    def goto(items: FrozenSet, symbol: str) -> FrozenSet:
-        """Compute goto(items, symbol)"""
-        moved = {
-            (A, production, dot+1) 
-            for (A, production, dot) in items 
-            if dot < len(production) and production[dot] == symbol
-        }
-        return closure(moved) if moved else frozenset()
-    
-    # Build canonical collection
-    start_item = closure({(aug_start, tuple(grammar[aug_start][0]), 0)})
-    states = [start_item]
-    transitions = {}
-    
-    while True:
-        added = False
-        for i, state in enumerate(states):
-            symbols = {
-                production[dot] 
-                for (A, production, dot) in state 
-                if dot < len(production)
-            }
-            
-            for symbol in symbols:
-                next_state = goto(state, symbol)
-                if next_state and next_state not in states:
-                    states.append(next_state)
-                    added = True
-                if next_state:
-                    transitions[(i, symbol)] = states.index(next_state)
+    def goto(items: FrozenSet[int]) -> Dict[int, FrozenSet[int]]:
+        """Compute the kernel of goto(items, symbol) for every symbol after a dot"""
+        by_next = defaultdict(list)
+        for item in items:
+            p, dot = item >> dot_bits, item & dot_mask
+            if dot < prod_len[p]:
+                # Advancing the dot is item + 1
+                by_next[prod_rhs[p][dot]].append(item + 1)
         
-        if not added:
-            break
+        return {symbol: frozenset(moved) for symbol, moved in by_next.items()}
+    
+    # Build canonical collection. An LR(0) state is determined by its
+    # kernel, so only kernels are stored; the closure is built while the
+    # state is expanded and dropped once its transitions and completed
+    # productions have been recorded
+    start_kernel = frozenset({aug_prod << dot_bits})
+    states = [start_kernel]
+    state_id = {start_kernel: 0}
+    transitions = []  # transitions[i] = {symbol: target state}
+    reductions = []   # reductions[i] = productions completed in state i
+    
+    # States are appended as they are discovered; each is expanded once
+    i = 0
+    while i < len(states):
+        items = closure(states[i])
+        
+        targets = {}
+        for symbol, kernel in goto(items).items():
+            idx = state_id.get(kernel)
+            if idx is None:
+                idx = len(states)
+                state_id[kernel] = idx
+                states.append(kernel)
+            targets[symbol] = idx
+        transitions.append(targets)
+        reductions.append([
+            item >> dot_bits for item in items 
+            if item & dot_mask == prod_len[item >> dot_bits]
+        ])
+        
+        i += 1
+    
+    # Build ACTION and GOTO tables; terminals are $ and every id after it
+    terminals = range(end_marker, len(names))
     
-    # Build ACTION and GOTO tables
-    terminals = {
-        s for nt in grammar for prod in grammar[nt] 
-        for s in prod if s not in grammar and s != EPSILON
-    }
-    terminals.add(END_MARKER)
+    # Reduce actions and FOLLOW terminals, expanded once per production
+    reduce_action = [
+        f"r({names[prod_nt[p]]} → {' '.join(names[s] for s in prod_rhs[p]) or EPSILON})" 
+        for p in range(aug_prod)
+    ]
+    follow_terminals = [mask_terminals(FOLLOW[A], num_nt) for A in range(num_nt)]
     
     ACTION = {i: {} for i in range(len(states))}
     GOTO = {i: {} for i in range(len(states))}
     conflicts = []
     
-    for i, state in enumerate(states):
-        for (A, production, dot) in state:
-            if dot < len(production):
-                # Shift or goto
-                symbol = production[dot]
-                next_state = transitions.get((i, symbol))
-                
-                if symbol in terminals:
-                    action = f"s{next_state}"
-                    if symbol in ACTION[i] and ACTION[i][symbol] != action:
-                        conflicts.append(f"Shift-Reduce conflict in state {i} on '{symbol}'")
-                    ACTION[i][symbol] = action
-                else:
-                    GOTO[i][symbol] = next_state
+    for i in range(len(states)):
+        row = ACTION[i]
+        
+        # Shift or goto, once per outgoing symbol
+        for symbol, next_state in transitions[i].items():
+            if symbol >= num_nt:
+                row[symbol] = f"s{next_state}"
             else:
-                # Reduce or accept
-                if A == aug_start:
-                    ACTION[i][END_MARKER] = 'acc'
-                else:
-                    prod_str = " ".join(production) if production else EPSILON
-                    action = f"r({A} → {prod_str})"
-                    
-                    for terminal in FOLLOW[A]:
-                        if terminal in ACTION[i] and ACTION[i][terminal] != action:
-                            conflicts.append(f"Reduce-Reduce conflict in state {i} on '{terminal}'")
-                        ACTION[i][terminal] = action
+                GOTO[i][symbol] = next_state
+        
+        # Reduce or accept
+        for p in reductions[i]:
+            if p == aug_prod:
+                prev = row.get(end_marker)
+                if prev is not None and prev != 'acc':
+                    kind = "Shift-Accept" if prev[0] == 's' else "Accept-Reduce"
+                    conflicts.append(f"{kind} conflict in state {i} on '{names[end_marker]}'")
+                row[end_marker] = 'acc'
+            else:
+                action = reduce_action[p]
+                
+                for terminal in follow_terminals[prod_nt[p]]:
+                    prev = row.get(terminal)
+                    if prev is not None and prev != action:
+                        kind = CONFLICT_KINDS.get(prev[0], "Reduce-Reduce")
+                        conflicts.append(f"{kind} conflict in state {i} on '{names[terminal]}'")
+                    row[terminal] = action
     
     if conflicts:
         print("\n⚠️  WARNING: Grammar is not SLR(1)!")
         for conflict in conflicts:
             print(f"   {conflict}")
     
-    return ACTION, GOTO, states, sorted(terminals)
+    return ACTION, GOTO, states, sorted(terminals, key=lambda s: names[s])
 
 
-def print_slr_tables(ACTION: Dict, GOTO: Dict, terminals: List[str]):
+def print_slr_tables(ACTION: Dict, GOTO: Dict, terminals: List[int], names: List[str]):
     """
     Print SLR(1) ACTION and GOTO tables
     """
-    print("\n" + "="*80)
-    print("SLR(1) ACTION TABLE")
-    print("="*80)
+    out = ["\n" + "="*80, "SLR(1) ACTION TABLE", "="*80]
     
     # ACTION table
-    header = f"{'State':^8s} | " + " | ".join(f"{t:^12s}" for t in terminals)
-    print(header)
-    print("-" * len(header))
+    header = "State".center(8) + " | " + " | ".join(names[t].center(12) for t in terminals)
+    out.append(header)
+    out.append("-" * len(header))
     
     for state in sorted(ACTION.keys()):
-        row = [f"{state:^8d}"]
-        for t in terminals:
-            row.append(f"{ACTION[state].get(t, ''):^12s}")
-        print(" | ".join(row))
+        actions = ACTION[state]
+        cells = [actions.get(t, '').center(12) for t in terminals]
+        out.append(" | ".join([str(state).center(8)] + cells))
+        
+        if len(out) >= FLUSH_ROWS:
+            write_lines(out)
+            out.clear()
     
     # GOTO table
-    non_terminals = sorted({nt for state in GOTO for nt in GOTO[state]})
+    non_terminals = sorted({nt for state in GOTO for nt in GOTO[state]}, key=lambda s: names[s])
     
     if non_terminals:
-        print("\n" + "="*80)
-        print("SLR(1) GOTO TABLE")
-        print("="*80)
+        out += ["\n" + "="*80, "SLR(1) GOTO TABLE", "="*80]
         
-        header = f"{'State':^8s} | " + " | ".join(f"{nt:^12s}" for nt in non_terminals)
-        print(header)
-        print("-" * len(header))
+        header = "State".center(8) + " | " + " | ".join(names[nt].center(12) for nt in non_terminals)
+        out.append(header)
+        out.append("-" * len(header))
         
         for state in sorted(GOTO.keys()):
-            row = [f"{state:^8d}"]
-            for nt in non_terminals:
-                val = GOTO[state].get(nt, '')
-                row.append(f"{val:^12s}")
-            print(" | ".join(row))
+            gotos = GOTO[state]
+            cells = [str(gotos.get(nt, '')).center(12) for nt in non_terminals]
+            out.append(" | ".join([str(state).center(8)] + cells))
+            
+            if len(out) >= FLUSH_ROWS:
+                write_lines(out)
+                out.clear()
     
-    print("="*80 + "\n")
+    out.append("="*80 + "\n")
+    write_lines(out)
 
 
 # ================ Main Program ================
-def print_sets(FIRST: Dict[str, Set[str]], FOLLOW: Dict[str, Set[str]]):
+def print_sets(FIRST: List[int], FOLLOW: List[int], names: List[str]):
     """Print FIRST and FOLLOW sets"""
+    num_nt = len(FIRST)
+    non_terminals = sorted(range(num_nt), key=lambda s: names[s])
+    
     print("\n" + "="*60)
     print("FIRST SETS")
     print("="*60)
-    for nt in sorted(FIRST.keys()):
-        print(f"FIRST({nt}) = {{{', '.join(sorted(FIRST[nt]))}}}")
+    for nt in non_terminals:
+        terms = sorted(names[t] for t in mask_terminals(FIRST[nt], num_nt))
+        print(f"FIRST({names[nt]}) = {{{', '.join(terms)}}}")
     
     print("\n" + "="*60)
     print("FOLLOW SETS")
     print("="*60)
-    for nt in sorted(FOLLOW.keys()):
-        print(f"FOLLOW({nt}) = {{{', '.join(sorted(FOLLOW[nt]))}}}")
+    for nt in non_terminals:
+        terms = sorted(names[t] for t in mask_terminals(FOLLOW[nt], num_nt))
+        print(f"FOLLOW({names[nt]}) = {{{', '.join(terms)}}}")
     print()
 
 
@@ -422,20 +715,25 @@ def main():
     if grammar is None:
         return
     
+    # Classify and intern symbols to integer ids
+    nonterminals, terminals = classify(grammar)
+    names, prods = intern_grammar(grammar, nonterminals, terminals)
+    start = names.index(start)
+    
     # Compute FIRST and FOLLOW
-    FIRST = compute_first(grammar)
-    FOLLOW = compute_follow(grammar, FIRST, start)
+    FIRST = compute_first(prods)
+    FOLLOW = compute_follow(prods, FIRST, start)
     
     # Display sets
-    print_sets(FIRST, FOLLOW)
+    print_sets(FIRST, FOLLOW, names)
     
     # Build and display parsing table
     if algo == "LL1":
-        table = build_ll1_table(grammar, FIRST, FOLLOW)
-        print_ll1_table(table)
+        table = build_ll1_table(prods, FIRST, FOLLOW, names)
+        print_ll1_table(table, names)
     else:
-        ACTION, GOTO, states, terminals = build_slr_parser(grammar, FIRST, FOLLOW, start)
-        print_slr_tables(ACTION, GOTO, terminals)
+        ACTION, GOTO, states, terminals = build_slr_parser(prods, FIRST, FOLLOW, start, names)
+        print_slr_tables(ACTION, GOTO, terminals, names)
         print(f"\nTotal states: {len(states)}")
 
 